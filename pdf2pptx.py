@@ -1,14 +1,23 @@
 import argparse
+import hashlib
+import io
 import os
 import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import tempfile
 from PIL import Image
 from PIL import ImageFilter
 import fitz
 from pptx import Presentation
 from pptx.util import Inches
 
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
 
 def clear_screen():
     """Clear the terminal screen based on the operating system."""
@@ -110,11 +119,10 @@ def convert_pdf_to_high_quality_png(pdf_path, output_dir, page_num, dpi=300, use
             # Optional: Apply sharpening for better text clarity
             img = img.filter(ImageFilter.SHARPEN)
 
-            # Save with optimization
+            # Save with fast compression
             img.save(output_path, "PNG",
                      dpi=(dpi, dpi),
-                     optimize=True,
-                     compress_level=6)
+                     compress_level=1)
         else:
             # Save directly (faster)
             pix.save(output_path)
@@ -126,9 +134,150 @@ def convert_pdf_to_high_quality_png(pdf_path, output_dir, page_num, dpi=300, use
         print(f"Error converting page {page_num + 1} to PNG: {e}")
         return None
 
+def is_grayscale_document(pdf_doc):
+    """
+    Detect whether a PDF has no color content on any page.
+
+    Args:
+        pdf_doc: Open fitz document
+
+    Returns:
+        bool: True if every page renders with R == G == B
+    """
+    for page in pdf_doc.pages():
+        # A low-resolution render is enough to spot colored content
+        pix = page.get_pixmap(matrix=fitz.Matrix(0.25, 0.25), alpha=False)
+        samples = pix.samples
+        if not samples[0::3] == samples[1::3] == samples[2::3]:
+            return False
+
+    return True
+
+# PDF document opened once per worker process by init_render_worker
+_worker_doc = None
+# Rendering backend of this worker ("pymupdf" or "pdfium")
+_worker_backend = "pymupdf"
+# Encoded images of recently rendered pages in this worker (LRU), keyed by pixel hash
+_worker_cache = OrderedDict()
+# Maximum number of encoded images kept per worker for duplicate pages
+_WORKER_CACHE_SIZE = 64
+
+def init_render_worker(pdf_path, backend="pymupdf"):
+    """
+    Open the PDF document once in a worker process.
+
+    Args:
+        pdf_path: Path to PDF file (as string, so it can be pickled)
+        backend: Rendering backend ("pymupdf" or "pdfium")
+    """
+    global _worker_doc, _worker_backend
+    _worker_backend = backend
+    if backend == "pdfium":
+        _worker_doc = pdfium.PdfDocument(pdf_path)
+    else:
+        _worker_doc = fitz.open(pdf_path)
+
+def render_page(page_num, dpi, target_height=1024, image_format="jpeg", grayscale=False):
+    """
+    Render a single PDF page to a slide image (runs in a worker process
+    set up by init_render_worker).
+
+    Args:
+        page_num: Page number (0-indexed)
+        dpi: Maximum resolution for rendering
+        target_height: Height in pixels of the slide image
+        image_format: Embedded image format ("jpeg" or "png")
+        grayscale: Render with a single gray channel instead of RGB
+
+    Returns:
+        Encoded image data as bytes
+    """
+    page = _worker_doc[page_num]
+
+    # Render page directly at the final image height (capped by DPI),
+    # so the rasterizer does the scaling and no resize pass is needed
+    page_height = page.get_height() if _worker_backend == "pdfium" else page.rect.height
+    scale = min(dpi / 72, target_height / page_height)
+
+    if _worker_backend == "pdfium":
+        bitmap = page.render(scale=scale, grayscale=grayscale)
+        page.close()
+        width, height = bitmap.width, bitmap.height
+        samples = bitmap.buffer
+    else:
+        colorspace = fitz.csGRAY if grayscale else fitz.csRGB
+        pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), colorspace=colorspace, alpha=False)
+        width, height = pix.width, pix.height
+        samples = pix.samples_mv
+
+    # Identical pages (e.g. repeated section dividers) are encoded only once.
+    # The cache is per worker process, so a repeat that lands on another
+    # worker is encoded again; the savings come mostly from later repeats.
+    key = (width, height, image_format, hashlib.sha1(samples).digest())
+    data = _worker_cache.get(key)
+    if data is not None:
+        _worker_cache.move_to_end(key)
+        return data
+
+    if _worker_backend == "pdfium":
+        img = bitmap.to_pil()
+        buf = io.BytesIO()
+        if image_format == "jpeg":
+            img.save(buf, "JPEG", quality=85, optimize=False)
+        else:
+            img.save(buf, "PNG", compress_level=1)
+        data = buf.getvalue()
+    elif image_format == "jpeg":
+        # JPEG is much smaller and faster to encode for photographic content
+        data = pix.tobytes("jpg", jpg_quality=85)
+    else:
+        # PNG avoids compression artifacts on text-heavy pages
+        data = pix.tobytes("png")
+
+    _worker_cache[key] = data
+    if len(_worker_cache) > _WORKER_CACHE_SIZE:
+        _worker_cache.popitem(last=False)
+    return data
+
+def render_pages(pdf_path, page_count, dpi, image_format="jpeg", grayscale=False,
+                 backend="pymupdf"):
+    """
+    Render all PDF pages in worker processes.
+
+    Only a bounded number of pages is in flight at once, so rendering
+    overlaps with the consumer without holding the whole deck in memory.
+
+    Args:
+        pdf_path: Path to PDF file
+        page_count: Number of pages in the PDF
+        dpi: Maximum resolution for rendering
+        image_format: Embedded image format ("jpeg" or "png")
+        grayscale: Render with a single gray channel instead of RGB
+        backend: Rendering backend ("pymupdf" or "pdfium")
+
+    Yields:
+        Encoded image data as bytes, in page order
+    """
+    max_workers = min(os.cpu_count() or 1, 4)
+    max_pending = max_workers * 2
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_render_worker,
+                             initargs=(str(pdf_path), backend)) as executor:
+        pending = deque()
+        next_page = 0
+
+        for _ in range(page_count):
+            while next_page < page_count and len(pending) < max_pending:
+                pending.append(executor.submit(render_page, next_page, dpi,
+                                               image_format=image_format,
+                                               grayscale=grayscale))
+                next_page += 1
+
+            yield pending.popleft().result()
+
 def pdf_to_pptx(pdf_path, output_path=None, aspect_ratio="4:3",
                 custom_width=None, custom_height=None,
-                quality="high", dpi=600, method="png"):
+                quality="high", dpi=600, method="png", image_format="jpeg",
+                grayscale=False, backend="pymupdf"):
     """
     Convert PDF file to PPTX presentation without Ghostscript.
 
@@ -138,9 +287,13 @@ def pdf_to_pptx(pdf_path, output_path=None, aspect_ratio="4:3",
         aspect_ratio: Slide aspect ratio
         custom_width: Custom width in inches (if aspect_ratio is "custom")
         custom_height: Custom height in inches (if aspect_ratio is "custom")
-        quality: Image quality ("low", "medium", "high", "ultra")
-        dpi: Resolution for rendering (overrides quality setting if provided)
+        quality: Maximum rendering DPI preset ("low", "medium", "high", "ultra")
+        dpi: Maximum resolution for rendering (overrides quality setting if provided);
+             pages are rendered at 1024 pixels high unless this is lower
         method: Conversion method ("png")
+        image_format: Embedded image format ("jpeg" or "png")
+        grayscale: Render pages in grayscale (True, False or "auto" to detect)
+        backend: Rendering backend ("pymupdf" or "pdfium", requires pypdfium2)
 
     Returns:
         bool: True if conversion successful, False otherwise
@@ -156,6 +309,18 @@ def pdf_to_pptx(pdf_path, output_path=None, aspect_ratio="4:3",
     else:
         output_path = pdf_path.with_suffix(".pptx")
 
+    if image_format not in ("jpeg", "png"):
+        print(f"Error: Unknown image format '{image_format}' (expected 'jpeg' or 'png').")
+        return False
+
+    if backend not in ("pymupdf", "pdfium"):
+        print(f"Error: Unknown backend '{backend}' (expected 'pymupdf' or 'pdfium').")
+        return False
+
+    if backend == "pdfium" and pdfium is None:
+        print("Error: The pdfium backend requires pypdfium2 (pip install pypdfium2).")
+        return False
+
     width_inches, height_inches = get_slide_dimensions(aspect_ratio, custom_width, custom_height)
 
     quality_settings = {
@@ -168,65 +333,54 @@ def pdf_to_pptx(pdf_path, output_path=None, aspect_ratio="4:3",
     if dpi is None and quality in quality_settings:
         dpi = quality_settings.get(quality, 600)
 
-    # Create temporary directory for intermediate images
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_dir = Path(temp_dir)
-
-        print(f"Processing: {pdf_path.name}")
-
-        # Open PDF document
-        pdf_doc = fitz.open(pdf_path)
-
-        print(f"PDF pages: {len(pdf_doc)}")
-
-        # Create PowerPoint presentation
-        prs = Presentation()
-        prs.slide_width = Inches(width_inches)
-        prs.slide_height = Inches(height_inches)
-        # Use blank slide layout
-        blank_slide_layout = prs.slide_layouts[6]
-
-        # Process each PDF page
-        for _, page in enumerate(pdf_doc.pages()):
-            # clear_screen()
-            # print(f"Processing page {_ + 1}/{len(pdf_doc)}...")
-
-            sys.stdout.write("\rProcessing: Page %d/%d" % (_ + 1, len(pdf_doc)))
+    print(f"Processing: {pdf_path.name}")
+
+    # Open PDF document
+    pdf_doc = fitz.open(pdf_path)
+    page_count = len(pdf_doc)
+    if grayscale == "auto":
+        grayscale = is_grayscale_document(pdf_doc)
+    pdf_doc.close()
+
+    print(f"PDF pages: {page_count}")
+    if grayscale:
+        print("Rendering in grayscale")
+
+    # Create PowerPoint presentation
+    prs = Presentation()
+    prs.slide_width = Inches(width_inches)
+    prs.slide_height = Inches(height_inches)
+    # Use blank slide layout
+    blank_slide_layout = prs.slide_layouts[6]
+
+    # Every image fills the entire slide
+    left = top = Inches(0)
+    slide_width, slide_height = prs.slide_width, prs.slide_height
+
+    # python-pptx is not process-safe, so slides are assembled here in page order
+    last_progress = 0.0
+    for i, img_data in enumerate(render_pages(pdf_path, page_count, dpi,
+                                              image_format, grayscale, backend)):
+        # Throttle progress output; console writes are slow on Windows
+        now = time.monotonic()
+        if now - last_progress > 0.1 or i == page_count - 1:
+            sys.stdout.write(f"\rProcessing: Page {i + 1}/{page_count}")
             sys.stdout.flush()
+            last_progress = now
 
-            # Render page as image with DPI
-            pix = page.get_pixmap(dpi=dpi)
+        # Create slide and add image
+        slide = prs.slides.add_slide(blank_slide_layout)
 
-            # Convert to PIL Image
-            img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-
-            # Resize image
-            target_height = 1024
-            ratio = target_height / img.height
-            new_width = int(img.width * ratio)
-            img = img.resize((new_width, target_height), Image.Resampling.LANCZOS)
-
-            # Save image to temporary directory
-            img_path = temp_dir / f"slide-{_}.png"
-            img.save(img_path, "PNG")
-
-            # Create slide and add image
-            slide = prs.slides.add_slide(blank_slide_layout)
+        # Add image to fill entire slide
+        slide.shapes.add_picture(io.BytesIO(img_data), left, top,
+                                 width=slide_width,
+                                 height=slide_height)
 
-            # Add image to fill entire slide
-            left = top = Inches(0)
-            slide.shapes.add_picture(str(img_path), left, top,
-                                     width=prs.slide_width,
-                                     height=prs.slide_height)
-
-        # Close PDF document
-        pdf_doc.close()
-
-        # Save PowerPoint presentation
-        prs.save(str(output_path))
-        print("\r")
-        print(f"Output file: {output_path}")
-        print("Conversion completed!")
+    # Save PowerPoint presentation
+    prs.save(str(output_path))
+    print("\r")
+    print(f"Output file: {output_path}")
+    print("Conversion completed!")
 
     return True
 
@@ -275,13 +429,15 @@ def main():
         "-q", "--quality",
         choices=["low", "medium", "high", "ultra"],
         default="high",
-        help="Image quality (default: high)"
+        help="Maximum rendering DPI: low=150, medium=300, high=600, ultra=1200 "
+             "(default: high); slides are rendered at most 1024 px high"
     )
 
     parser.add_argument(
         "-d", "--dpi",
         type=int,
-        help="DPI for rendering (overrides --quality)"
+        help="Maximum DPI for rendering (overrides --quality); "
+             "slides are rendered at most 1024 px high"
     )
 
     parser.add_argument(
@@ -291,6 +447,27 @@ def main():
         help="Conversion method (default: auto), indev"
     )
 
+    parser.add_argument(
+        "-f", "--format",
+        choices=["jpeg", "png"],
+        default="jpeg",
+        help="Embedded image format (default: jpeg), png for text-heavy slides"
+    )
+
+    parser.add_argument(
+        "-g", "--grayscale",
+        choices=["off", "on", "auto"],
+        default="off",
+        help="Render pages in grayscale (default: off), auto detects text-only PDFs"
+    )
+
+    parser.add_argument(
+        "-b", "--backend",
+        choices=["pymupdf", "pdfium"],
+        default="pymupdf",
+        help="PDF rendering backend (default: pymupdf), pdfium requires pypdfium2"
+    )
+
     parser.add_argument(
         "--list-aspects",
         action="store_true",
@@ -349,7 +526,10 @@ def main():
             custom_height=args.height,
             quality=args.quality,
             dpi=args.dpi,
-            method=args.method
+            method=args.method,
+            image_format=args.format,
+            grayscale={"off": False, "on": True, "auto": "auto"}[args.grayscale],
+            backend=args.backend
         )
 
     # Exit with appropriate code